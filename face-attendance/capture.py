@@ -8,6 +8,7 @@ import os
 from datetime import datetime
 import tkinter as tk
 from tkinter import simpledialog, messagebox
+from quality import FaceQualityScorer, ENROLLMENT_THRESHOLDS
 
 def capture_for_label():
     """
@@ -38,10 +39,14 @@ def capture_for_label():
         messagebox.showerror("Error", f"Camera initialization error: {e}")
         return
 
+    face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+    quality_scorer = FaceQualityScorer(**ENROLLMENT_THRESHOLDS)
+
     print(f"📷 Capturing images for: {name}")
     print("Press SPACE to capture image, ESC to exit")
 
     image_count = 0
+    last_rejection = None
 
     while True:
         ret, frame = cap.read()
@@ -49,20 +54,38 @@ def capture_for_label():
             print("❌ Failed to grab frame")
             break
 
-        # Overlay instructions
-        cv2.putText(frame, f"Capturing for: {name}", (10, 30),
+        # Overlay instructions on a copy, so the saved image is the clean frame the user saw
+        display = frame.copy()
+        cv2.putText(display, f"Capturing for: {name}", (10, 30),
                     cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-        cv2.putText(frame, f"Images captured: {image_count}", (10, 60),
+        cv2.putText(display, f"Images captured: {image_count}", (10, 60),
                     cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-        cv2.putText(frame, "Press SPACE to capture, ESC to exit", (10, 90),
+        cv2.putText(display, "Press SPACE to capture, ESC to exit", (10, 90),
                     cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 2)
+        if last_rejection:
+            cv2.putText(display, f"Rejected: {last_rejection}", (10, 120),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
 
         # Show the frame
-        cv2.imshow('Face Capture', frame)
+        cv2.imshow('Face Capture', display)
         key = cv2.waitKey(1) & 0xFF
 
         # Capture image
         if key == ord(' '):
+            # Only save images whose largest face passes the quality gate
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            faces = face_cascade.detectMultiScale(gray, 1.1, 4)
+            if len(faces) == 0:
+                ok, reason = quality_scorer.reject("no face detected")
+            else:
+                x, y, w, h = max(faces, key=lambda box: box[2] * box[3])
+                ok, reason = quality_scorer.check(gray[y:y+h, x:x+w])
+            if not ok:
+                last_rejection = reason
+                print(f"⚠️  Image rejected: {reason}")
+                continue
+            last_rejection = None
+
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"{name}_{timestamp}_{image_count + 1}.jpg"
             filepath = os.path.join(person_dir, filename)
@@ -78,6 +101,7 @@ def capture_for_label():
     cv2.destroyAllWindows()
     messagebox.showinfo("Done", f"Capture session completed! Saved {image_count} images for {name}")
     print(f"🎯 Capture session completed! Saved {image_count} images for {name}")
+    print(f"🔍 Quality gate: {quality_scorer.summary()}")
 
 
 def list_known_faces():
@@ -0,0 +1,297 @@
+"""
+Face Recognition Attendance System - Multi-Process Inference Module
+Worker processes with their own resident VGG-Face model, fed face crops
+through a ring of shared-memory slots
+"""
+
+import os
+import time
+import queue
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import cv2
+import numpy as np
+
+# Configuration
+WORKER_THREADS = 1  # TensorFlow/OpenCV threads per worker process
+CROP_SIZE = 224  # VGG-Face input size; crops are resized straight into their slot
+SLOTS_PER_WORKER = 2  # Ring size = workers * SLOTS_PER_WORKER
+READY_TIMEOUT = 300  # Seconds to wait for all workers to load the model
+TASK_TIMEOUT = 30  # Seconds before an unanswered crop is given up on
+
+
+def _thread_env(threads):
+    """Environment variables that limit TensorFlow/OpenMP threads in a worker"""
+    return {
+        "OMP_NUM_THREADS": str(threads),
+        "TF_NUM_INTRAOP_THREADS": str(threads),
+        "TF_NUM_INTEROP_THREADS": "1",
+    }
+
+
+def _worker_main(worker_id, shm_name, slot_count, task_queue, result_queue, ready, current, threads):
+    """Worker process: load the model once, then embed slots until a None task arrives"""
+    cv2.setNumThreads(threads)
+
+    import tensorflow as tf
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(threads)
+        tf.config.threading.set_inter_op_parallelism_threads(1)
+    except RuntimeError:
+        pass  # Runtime already initialized; the inherited env vars from _thread_env apply
+    from deepface import DeepFace
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    ring = np.ndarray((slot_count, CROP_SIZE, CROP_SIZE, 3), dtype=np.uint8, buffer=shm.buf)
+
+    DeepFace.build_model('VGG-Face')  # Cached by DeepFace, stays resident for later calls
+    ready.release()
+
+    try:
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+            seq, slot = task
+            current[worker_id] = seq
+            try:
+                embedding = DeepFace.represent(ring[slot], model_name='VGG-Face', enforce_detection=False)
+                result = embedding[0]["embedding"] if embedding else None
+            except Exception as e:
+                print(f"❌ Worker {os.getpid()} recognition error: {e}")
+                result = None
+            result_queue.put((seq, slot, result))
+            current[worker_id] = -1
+    finally:
+        del ring
+        shm.close()
+
+
+class InferencePool:
+    """
+    Pool of worker processes that embed face crops.
+    Crops are written into shared-memory slots, only (seq, slot) indices go
+    through the task queue, and results are returned in submission order.
+    Crops held by a worker that exits, or unanswered after TASK_TIMEOUT,
+    are returned with a None embedding so their slots are not lost.
+    """
+
+    def __init__(self, workers, threads_per_worker=WORKER_THREADS, slots=None):
+        self.worker_count = workers
+        self.slot_count = slots or workers * SLOTS_PER_WORKER
+        self.shm = shared_memory.SharedMemory(create=True, size=self.slot_count * CROP_SIZE * CROP_SIZE * 3)
+        self.ring = np.ndarray((self.slot_count, CROP_SIZE, CROP_SIZE, 3), dtype=np.uint8, buffer=self.shm.buf)
+        self.free_slots = list(range(self.slot_count))
+
+        self.next_seq = 0  # Sequence number of the next submitted crop
+        self.next_seq_out = 0  # Sequence number of the next result to hand back
+        self.finished = {}  # seq -> embedding, for results that arrived out of order
+        self.outstanding = {}  # seq -> (slot, submit time), for crops still being embedded
+        self.dead_workers = set()
+
+        ctx = mp.get_context("spawn")  # TensorFlow is not fork-safe
+        self.task_queue = ctx.Queue()
+        self.result_queue = ctx.Queue()
+        self.ready = ctx.Semaphore(0)
+        self.current = ctx.RawArray('q', [-1] * workers)  # seq each worker is embedding, -1 if idle
+        self.processes = [
+            ctx.Process(target=_worker_main,
+                        args=(worker_id, self.shm.name, self.slot_count, self.task_queue,
+                              self.result_queue, self.ready, self.current, threads_per_worker),
+                        daemon=True)
+            for worker_id in range(workers)
+        ]
+
+        # A spawned child re-imports the parent's main module, which may import
+        # deepface (and so TensorFlow) before _worker_main runs. Setting the
+        # thread limits in the environment the child inherits is the only way
+        # they take effect before that import.
+        thread_env = _thread_env(threads_per_worker)
+        saved_env = {var: os.environ.get(var) for var in thread_env}
+        os.environ.update(thread_env)
+        try:
+            for process in self.processes:
+                process.start()
+        finally:
+            for var, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(var, None)
+                else:
+                    os.environ[var] = value
+
+    def wait_ready(self, timeout=READY_TIMEOUT):
+        """Block until every worker has loaded its model"""
+        deadline = time.monotonic() + timeout
+        ready_count = 0
+        while ready_count < self.worker_count:
+            if self.ready.acquire(timeout=1):
+                ready_count += 1
+            elif time.monotonic() > deadline or not all(p.is_alive() for p in self.processes):
+                return False
+        return True
+
+    @property
+    def in_flight(self):
+        return self.slot_count - len(self.free_slots)
+
+    @property
+    def alive_workers(self):
+        return self.worker_count - len(self.dead_workers)
+
+    def submit(self, face_image):
+        """
+        Resize a face crop into a free slot and queue it for embedding.
+        Returns its sequence number, or None if every slot is busy.
+        """
+        if not self.free_slots or not self.alive_workers:
+            return None
+        slot = self.free_slots.pop()
+        cv2.resize(face_image, (CROP_SIZE, CROP_SIZE), dst=self.ring[slot])
+        seq = self.next_seq
+        self.next_seq += 1
+        self.outstanding[seq] = (slot, time.monotonic())
+        self.task_queue.put((seq, slot))
+        return seq
+
+    def _fail(self, seq):
+        """Give up on an outstanding crop: free its slot and report no embedding"""
+        slot, _ = self.outstanding.pop(seq)
+        self.free_slots.append(slot)
+        self.finished[seq] = None
+
+    def _reap_workers(self):
+        """Fail the crops of workers that exited, or of all crops once none are left"""
+        for worker_id, process in enumerate(self.processes):
+            if worker_id in self.dead_workers or process.is_alive():
+                continue
+            self.dead_workers.add(worker_id)
+            print(f"❌ Inference worker {process.pid} exited with code {process.exitcode}")
+            seq = self.current[worker_id]
+            if seq in self.outstanding:
+                self._fail(seq)
+
+        now = time.monotonic()
+        for seq, (_, submitted) in list(self.outstanding.items()):
+            if not self.alive_workers or now - submitted > TASK_TIMEOUT:
+                self._fail(seq)
+
+    def poll(self, timeout=0):
+        """
+        Collect finished results, waiting up to timeout seconds for the first one.
+        Returns a list of (seq, embedding) in submission order.
+        """
+        try:
+            message = self.result_queue.get(timeout=timeout) if timeout else self.result_queue.get_nowait()
+            while True:
+                seq, slot, embedding = message
+                # Late results for crops already given up on must not free the slot twice
+                if seq in self.outstanding:
+                    del self.outstanding[seq]
+                    self.free_slots.append(slot)
+                    self.finished[seq] = embedding
+                message = self.result_queue.get_nowait()
+        except queue.Empty:
+            pass
+        self._reap_workers()
+
+        ready = []
+        while self.next_seq_out in self.finished:
+            ready.append((self.next_seq_out, self.finished.pop(self.next_seq_out)))
+            self.next_seq_out += 1
+        return ready
+
+    def map(self, face_images):
+        """Embed a list of crops, blocking until all are done; results keep input order"""
+        results = []
+        for face_image in face_images:
+            while self.submit(face_image) is None:
+                if not self.alive_workers:
+                    raise RuntimeError("All inference workers have exited")
+                results.extend(embedding for _, embedding in self.poll(timeout=0.1))
+        while self.in_flight:
+            results.extend(embedding for _, embedding in self.poll(timeout=0.1))
+        return results
+
+    def close(self):
+        for _ in self.processes:
+            self.task_queue.put(None)
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        del self.ring
+        self.shm.close()
+        self.shm.unlink()
+
+
+def _load_sample_crops(count):
+    """Face images from known_faces, or random noise if there are none"""
+    crops = []
+    known_faces_dir = "known_faces"
+    if os.path.exists(known_faces_dir):
+        for person in os.listdir(known_faces_dir):
+            person_dir = os.path.join(known_faces_dir, person)
+            if not os.path.isdir(person_dir):
+                continue
+            for img_file in os.listdir(person_dir):
+                if img_file.lower().endswith((".jpg", ".jpeg", ".png")):
+                    img = cv2.imread(os.path.join(person_dir, img_file))
+                    if img is not None:
+                        crops.append(img)
+    if not crops:
+        crops = [np.random.randint(0, 256, (CROP_SIZE, CROP_SIZE, 3), dtype=np.uint8)]
+    return [crops[i % len(crops)] for i in range(count)]
+
+
+def _benchmark_in_process(crops):
+    """Throughput of the current INFERENCE_WORKERS = 0 path: the model in this process, default threading"""
+    from deepface import DeepFace
+
+    crops = [cv2.resize(crop, (CROP_SIZE, CROP_SIZE)) for crop in crops]
+    DeepFace.represent(crops[0], model_name='VGG-Face', enforce_detection=False)  # Load and warm up
+
+    start = time.monotonic()
+    for crop in crops:
+        DeepFace.represent(crop, model_name='VGG-Face', enforce_detection=False)
+    return len(crops) / (time.monotonic() - start)
+
+
+def benchmark_workers(worker_counts=(1, 2, 4, 8), thread_counts=(WORKER_THREADS,), crop_count=200):
+    """
+    Measure embedding throughput for each worker count and threads-per-worker
+    setting, and print the speedup over running the model in-process
+    """
+    crops = _load_sample_crops(crop_count)
+
+    print(f"\n⏱️  INFERENCE WORKER BENCHMARK ({crop_count} crops, {os.cpu_count()} CPUs)")
+    print("=" * 60)
+
+    baseline = _benchmark_in_process(crops)
+    print(f"{'In-process (default threads)':36s} | {baseline:7.1f} crops/s | speedup x1.00")
+
+    for threads in thread_counts:
+        for workers in worker_counts:
+            pool = InferencePool(workers, threads)
+            try:
+                if not pool.wait_ready():
+                    print(f"❌ Workers did not start within {READY_TIMEOUT}s")
+                    return
+                pool.map(crops[:workers])  # Warm up every worker
+
+                start = time.monotonic()
+                pool.map(crops)
+                elapsed = time.monotonic() - start
+            except RuntimeError as e:
+                print(f"❌ Benchmark with {workers} workers x {threads} threads failed: {e}")
+                return
+            finally:
+                pool.close()
+
+            throughput = crop_count / elapsed
+            print(f"Workers: {workers:2d} x {threads:2d} threads "
+                  f"({workers * threads:3d} cores) | {throughput:7.1f} crops/s | "
+                  f"speedup x{throughput / baseline:.2f}")
+
+
+if __name__ == "__main__":
+    benchmark_workers()
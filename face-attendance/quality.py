@@ -0,0 +1,130 @@
+"""
+Face Recognition Attendance System - Face Quality Module
+Cheap checks that reject unusable face crops before running the embedding model
+"""
+
+import cv2
+import numpy as np
+
+# Configuration
+# Calibrated on the Haar crops of known_faces/: every enrolled image passes
+# ENROLLMENT_THRESHOLDS (lowest seen: size 74, sharpness 32, brightness 227
+# max, contrast 30, symmetry 0.80). Live gating is looser, since a skipped
+# crop there means a missed recognition rather than a bad enrollment image.
+ENROLLMENT_THRESHOLDS = {
+    'min_size': 60,  # Smallest accepted crop side, in pixels
+    'min_sharpness': 25.0,  # Laplacian variance of the normalized crop
+    'min_brightness': 40,  # Mean gray level
+    'max_brightness': 235,
+    'min_contrast': 20,  # Gray level standard deviation
+    'min_symmetry': 0.78,  # Left/right mirror similarity, 1.0 = perfectly symmetric
+}
+LIVE_THRESHOLDS = {
+    'min_size': 40,
+    'min_sharpness': 15.0,
+    'min_brightness': 30,
+    'max_brightness': 245,
+    'min_contrast': 15,
+    'min_symmetry': 0.72,
+}
+NORMALIZED_SIZE = 128  # Crops are resized to this before scoring
+
+
+class FaceQualityScorer:
+    """
+    Scores face crops on size, sharpness, brightness/contrast and a rough
+    frontality (left/right symmetry) check, and counts how many were rejected.
+    """
+
+    def __init__(self, min_size=ENROLLMENT_THRESHOLDS['min_size'],
+                 min_sharpness=ENROLLMENT_THRESHOLDS['min_sharpness'],
+                 min_brightness=ENROLLMENT_THRESHOLDS['min_brightness'],
+                 max_brightness=ENROLLMENT_THRESHOLDS['max_brightness'],
+                 min_contrast=ENROLLMENT_THRESHOLDS['min_contrast'],
+                 min_symmetry=ENROLLMENT_THRESHOLDS['min_symmetry']):
+        self.min_size = min_size
+        self.min_sharpness = min_sharpness
+        self.min_brightness = min_brightness
+        self.max_brightness = max_brightness
+        self.min_contrast = min_contrast
+        self.min_symmetry = min_symmetry
+        self.reset_counters()
+
+    def reset_counters(self):
+        self.checked = 0
+        self.passed = 0
+        self.rejected = {}
+
+    def score(self, face_image):
+        """Return the quality metrics of a BGR or grayscale face crop"""
+        if face_image.ndim == 3:
+            gray = cv2.cvtColor(face_image, cv2.COLOR_BGR2GRAY)
+        else:
+            gray = face_image
+        height, width = gray.shape[:2]
+
+        face = cv2.resize(gray, (NORMALIZED_SIZE, NORMALIZED_SIZE))
+        half = NORMALIZED_SIZE // 2
+        # Compare the halves around their own means so side lighting is not read as a turned head
+        left = face[:, :half].astype(np.float32)
+        right = cv2.flip(face[:, half:], 1).astype(np.float32)
+        asymmetry = np.mean(np.abs((left - left.mean()) - (right - right.mean())))
+
+        return {
+            'size': min(height, width),
+            'sharpness': cv2.Laplacian(face, cv2.CV_64F).var(),
+            'brightness': face.mean(),
+            'contrast': face.std(),
+            'symmetry': 1 - asymmetry / 255,
+        }
+
+    def check(self, face_image):
+        """
+        Check a face crop against the thresholds.
+        Returns (ok, reason) where reason names the first failed check.
+        """
+        self.checked += 1
+        reason = None
+
+        height, width = face_image.shape[:2]
+        if min(height, width) < self.min_size:
+            reason = "too small"
+        else:
+            metrics = self.score(face_image)
+            if metrics['sharpness'] < self.min_sharpness:
+                reason = "blurry"
+            elif metrics['brightness'] < self.min_brightness:
+                reason = "too dark"
+            elif metrics['brightness'] > self.max_brightness:
+                reason = "too bright"
+            elif metrics['contrast'] < self.min_contrast:
+                reason = "low contrast"
+            elif metrics['symmetry'] < self.min_symmetry:
+                reason = "not frontal"
+
+        if reason:
+            self.rejected[reason] = self.rejected.get(reason, 0) + 1
+            return False, reason
+        self.passed += 1
+        return True, None
+
+    def reject(self, reason):
+        """Count a capture rejected before scoring (e.g. no face found) in the counters"""
+        self.checked += 1
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+        return False, reason
+
+    @property
+    def skipped(self):
+        return self.checked - self.passed
+
+    def summary(self):
+        """One-line summary of how many crops were skipped and why"""
+        if not self.checked:
+            return "No faces checked"
+        percent = 100 * self.skipped / self.checked
+        text = f"Skipped {self.skipped}/{self.checked} faces ({percent:.0f}%)"
+        if self.rejected:
+            reasons = ", ".join(f"{reason}: {count}" for reason, count in sorted(self.rejected.items()))
+            text += f" [{reasons}]"
+        return text
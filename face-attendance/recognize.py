@@ -5,6 +5,7 @@ Real-time face recognition and attendance marking
 
 import cv2
 import os
+import time
 import numpy as np
 import pandas as pd
 from datetime import datetime, date
@@ -12,12 +13,72 @@ from deepface import DeepFace
 import tkinter as tk
 from tkinter import messagebox
 import pickle
+from collections import deque
 from PIL import Image, ImageTk
+from quality import FaceQualityScorer, LIVE_THRESHOLDS
+from inference_pool import InferencePool
 
 # Configuration
 TOLERANCE = 0.6  # Similarity threshold
 ATTENDANCE_FILE = "attendance.csv"
 EMBEDDINGS_FILE = "embeddings.pkl"
+CAPTURE_INTERVAL_MS = 10  # How often the live loop polls the camera
+DISPLAY_FPS = 30  # Max canvas redraws per second
+INFERENCE_FPS = 10  # Max detection + recognition passes per second
+INFERENCE_WORKERS = 0  # Embedding worker processes; 0 runs the model in the GUI process
+
+
+class FrameRenderer:
+    """
+    Draws frames onto a Tk canvas without per-frame allocations.
+    Keeps one canvas image item, one PhotoImage, one RGBA buffer and one
+    block-backed PIL image, and only redraws when a new frame is available
+    and the FPS cap allows it.
+    """
+
+    def __init__(self, canvas, max_fps=DISPLAY_FPS):
+        self.canvas = canvas
+        self.min_interval = 1.0 / max_fps if max_fps else 0
+        self.last_render = 0
+        self.rendered_seq = None
+        self.buffer = None
+        self.pil_image = None
+        self.photo = None
+        self.image_item = canvas.create_image(0, 0, anchor=tk.NW)
+
+    def buffer_for(self, shape):
+        """Return the RGBA buffer for frames of this shape, reallocating only if the size changed"""
+        height, width = shape[:2]
+        if self.buffer is None or self.buffer.shape[:2] != (height, width):
+            self.buffer = np.empty((height, width, 4), dtype=np.uint8)
+            # PhotoImage.paste only skips its per-call allocate-and-convert step for
+            # block-backed images in the photo's own mode; Image.new and frombuffer
+            # images are not block-backed
+            self.pil_image = Image.Image()._new(Image.core.new_block("RGBA", (width, height)))
+            self.photo = ImageTk.PhotoImage("RGBA", (width, height))
+            self.canvas.itemconfig(self.image_item, image=self.photo)
+            self.canvas.config(width=width, height=height)
+        return self.buffer
+
+    def due(self, frame_seq):
+        """True if frame_seq has not been shown yet and the display FPS cap allows a redraw"""
+        if frame_seq == self.rendered_seq:
+            return False
+        return time.monotonic() - self.last_render >= self.min_interval
+
+    def present(self, frame_seq):
+        """Copy the buffer into the existing PhotoImage"""
+        self.pil_image.frombytes(self.buffer)
+        self.photo.paste(self.pil_image)
+        self.rendered_seq = frame_seq
+        self.last_render = time.monotonic()
+
+    def shown_pixel(self, x, y):
+        """RGB value currently displayed at (x, y), read back from the Tk photo image"""
+        value = self.canvas.tk.call(str(self.photo), "get", x, y)
+        if isinstance(value, str):
+            value = value.split()
+        return tuple(int(v) for v in value[:3])
 
 
 class FaceRecognizer:
@@ -25,6 +86,8 @@ class FaceRecognizer:
         self.known_face_embeddings = {}
         self.known_face_names = []
         self.attendance_marked_today = set()
+        self.quality_scorer = FaceQualityScorer(**LIVE_THRESHOLDS)
+        self.inference_pool = None
         self.load_attendance_data()
         self.load_known_faces()
 
@@ -50,23 +113,24 @@ class FaceRecognizer:
             return 0
         return dot_product / (norm1 * norm2)
 
+    def match_embedding(self, face_embedding):
+        best_match = None
+        highest_similarity = 0
+
+        for name, known_embedding in self.known_face_embeddings.items():
+            similarity = self.cosine_similarity(face_embedding, known_embedding)
+            if similarity > highest_similarity and similarity > TOLERANCE:
+                highest_similarity = similarity
+                best_match = name
+
+        return best_match, highest_similarity
+
     def recognize_face(self, face_image):
         try:
             embedding = DeepFace.represent(face_image, model_name='VGG-Face', enforce_detection=False)
             if not embedding or len(embedding) == 0:
                 return None, 0
-            face_embedding = embedding[0]["embedding"]
-
-            best_match = None
-            highest_similarity = 0
-
-            for name, known_embedding in self.known_face_embeddings.items():
-                similarity = self.cosine_similarity(face_embedding, known_embedding)
-                if similarity > highest_similarity and similarity > TOLERANCE:
-                    highest_similarity = similarity
-                    best_match = name
-
-            return best_match, highest_similarity
+            return self.match_embedding(embedding[0]["embedding"])
         except Exception as e:
             print(f"❌ Recognition error: {e}")
             return None, 0
@@ -120,6 +184,16 @@ class FaceRecognizer:
 
         self.face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
 
+        if INFERENCE_WORKERS:
+            print(f"🚀 Starting {INFERENCE_WORKERS} inference workers...")
+            self.inference_pool = InferencePool(INFERENCE_WORKERS)
+            if not self.inference_pool.wait_ready():
+                self.inference_pool.close()
+                self.inference_pool = None
+                self.cap.release()
+                messagebox.showerror("Error", "Inference workers failed to start!")
+                return
+
         # Tkinter window
         self.root = tk.Tk()
         self.root.title("Face Recognition Attendance System")
@@ -127,50 +201,150 @@ class FaceRecognizer:
 
         self.canvas = tk.Canvas(self.root, width=640, height=480)
         self.canvas.pack()
+        self.renderer = FrameRenderer(self.canvas)
 
         self.info_label = tk.Label(self.root, text=f"Known faces: {len(self.known_face_names)} | Today: {len(self.attendance_marked_today)}", font=("Helvetica", 12))
         self.info_label.pack()
 
+        self.frame_buffer = None
+        self.frame_seq = 0
+        self.last_inference = 0
+        self.face_results = []
+        self.pending_passes = deque()  # Inference passes still waiting on worker results
+        self.after_id = None
+
         self.update_frame()
         self.root.mainloop()
 
-    def update_frame(self):
-        ret, frame = self.cap.read()
-        if not ret:
-            self.root.after(10, self.update_frame)
-            return
-
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    def detect_faces(self, frame):
+        """
+        Detect faces in the BGR frame and run the quality gate on each.
+        Returns a list of (box, rgb_face, skip_reason); rgb_face is None for skipped faces.
+        """
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
         faces = self.face_cascade.detectMultiScale(gray, 1.1, 4)
 
+        detections = []
         for (x, y, w, h) in faces:
-            face_image = rgb_frame[y:y+h, x:x+w]
+            # Skip the embedding model for crops it cannot recognize anyway
+            ok, reason = self.quality_scorer.check(gray[y:y+h, x:x+w])
+            face_image = cv2.cvtColor(frame[y:y+h, x:x+w], cv2.COLOR_BGR2RGB) if ok else None
+            detections.append(((x, y, w, h), face_image, reason))
+        return detections
+
+    def detect_and_recognize(self, frame):
+        """Detect faces in the BGR frame and recognize them"""
+        results = []
+        for box, face_image, reason in self.detect_faces(frame):
+            if reason:
+                results.append((box, None, 0, reason))
+                continue
             name, confidence = self.recognize_face(face_image)
             if name:
-                color = (0, 255, 0)
-                label = f"{name} ({confidence:.2f})"
                 self.mark_attendance(name)
+            results.append((box, name, confidence, None))
+        return results
+
+    def submit_faces(self, frame):
+        """Queue detected faces on the inference pool; results are collected later"""
+        inference_pass = {'results': [], 'boxes': deque()}
+        for box, face_image, reason in self.detect_faces(frame):
+            if not reason and self.inference_pool.submit(face_image) is None:
+                reason = "busy"
+            if reason:
+                inference_pass['results'].append((box, None, 0, reason))
+                continue
+            inference_pass['boxes'].append(box)
+        self.pending_passes.append(inference_pass)
+        self.publish_finished_passes()
+
+    def collect_results(self):
+        """Match embeddings returned by the workers, in submission order"""
+        for _, embedding in self.inference_pool.poll():
+            inference_pass = next(p for p in self.pending_passes if p['boxes'])
+            box = inference_pass['boxes'].popleft()
+            name, confidence = self.match_embedding(embedding) if embedding is not None else (None, 0)
+            if name:
+                self.mark_attendance(name)
+            inference_pass['results'].append((box, name, confidence, None))
+        self.publish_finished_passes()
+
+        if not self.inference_pool.alive_workers:
+            # poll() has already failed every outstanding crop, so no pass is left waiting
+            print("❌ All inference workers exited, falling back to in-process inference")
+            self.inference_pool.close()
+            self.inference_pool = None
+            self.pending_passes.clear()
+            messagebox.showwarning("Inference Workers", "All inference workers exited.\n"
+                                   "Recognition continues in this process.")
+
+    def publish_finished_passes(self):
+        while self.pending_passes and not self.pending_passes[0]['boxes']:
+            self.face_results = self.pending_passes.popleft()['results']
+            self.update_info_label()
+
+    def draw_results(self, rgba_frame):
+        """Draw the latest recognition results onto the RGBA display frame"""
+        for (x, y, w, h), name, confidence, skip_reason in self.face_results:
+            # Colors carry an opaque alpha, otherwise the boxes would be transparent
+            if skip_reason:
+                color = (255, 255, 0, 255)
+                label = f"Skipped: {skip_reason}"
+            elif name:
+                color = (0, 255, 0, 255)
+                label = f"{name} ({confidence:.2f})"
             else:
-                color = (0, 0, 255)
+                color = (255, 0, 0, 255)
                 label = "Unknown"
-            cv2.rectangle(frame, (x, y), (x+w, y+h), color, 2)
-            cv2.putText(frame, label, (x, y-10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+            cv2.rectangle(rgba_frame, (x, y), (x+w, y+h), color, 2)
+            cv2.putText(rgba_frame, label, (x, y-10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+
+    def update_info_label(self):
+        text = (f"Known faces: {len(self.known_face_names)} | Today: {len(self.attendance_marked_today)}"
+                f" | Skipped: {self.quality_scorer.skipped}/{self.quality_scorer.checked}")
+        if self.info_label.cget("text") != text:
+            self.info_label.config(text=text)
+
+    def update_frame(self):
+        # Capture, inference and display each run at their own rate
+        if self.inference_pool:
+            self.collect_results()
+
+        ret, frame = self.cap.read(self.frame_buffer)
+        if ret:
+            self.frame_buffer = frame
+            self.frame_seq += 1
+
+            now = time.monotonic()
+            run_inference = now - self.last_inference >= 1.0 / INFERENCE_FPS
+            if self.inference_pool:
+                run_inference = run_inference and len(self.pending_passes) < self.inference_pool.alive_workers
 
-        self.info_label.config(text=f"Known faces: {len(self.known_face_names)} | Today: {len(self.attendance_marked_today)}")
+            if run_inference and self.inference_pool:
+                self.submit_faces(frame)
+                self.last_inference = now
+            elif run_inference:
+                self.face_results = self.detect_and_recognize(frame)
+                self.last_inference = now
+                self.update_info_label()
 
-        # Convert OpenCV image to Tkinter PhotoImage
-        img = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        img = Image.fromarray(img)
-        imgtk = ImageTk.PhotoImage(image=img)
-        self.canvas.imgtk = imgtk
-        self.canvas.create_image(0, 0, anchor=tk.NW, image=imgtk)
+            if self.renderer.due(self.frame_seq):
+                rgba_frame = self.renderer.buffer_for(frame.shape)
+                cv2.cvtColor(frame, cv2.COLOR_BGR2RGBA, dst=rgba_frame)
+                self.draw_results(rgba_frame)
+                self.renderer.present(self.frame_seq)
 
-        self.root.after(10, self.update_frame)
+        self.after_id = self.root.after(CAPTURE_INTERVAL_MS, self.update_frame)
 
     def on_closing(self):
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
         self.cap.release()
+        if self.inference_pool:
+            self.inference_pool.close()
+            self.inference_pool = None
         self.root.destroy()
+        print(f"🔍 Quality gate: {self.quality_scorer.summary()}")
         messagebox.showinfo("Session Ended", f"Total attendance today: {len(self.attendance_marked_today)}")
 
 
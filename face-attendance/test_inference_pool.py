@@ -0,0 +1,109 @@
+"""
+Tests for the multi-process inference pool, using a stub model package
+Run with: python -m pytest face-attendance
+"""
+
+import textwrap
+import numpy as np
+import pytest
+from inference_pool import InferencePool
+
+CRASH_VALUE = 13  # Crops filled with this value make the stub worker exit
+
+STUB_TENSORFLOW = '''
+class _Threading:
+    def set_intra_op_parallelism_threads(self, threads):
+        pass
+
+    def set_inter_op_parallelism_threads(self, threads):
+        pass
+
+
+class config:
+    threading = _Threading()
+'''
+
+STUB_DEEPFACE = f'''
+import os
+import random
+import time
+
+
+def build_model(model_name):
+    pass
+
+
+def represent(img, model_name, enforce_detection):
+    value = int(img[0, 0, 0])
+    if value == {CRASH_VALUE}:
+        os._exit(3)
+    time.sleep(random.random() * 0.02)  # Random latency so results finish out of order
+    return [{{"embedding": [value]}}]
+'''
+
+
+@pytest.fixture(scope="module")
+def stub_model_path(tmp_path_factory):
+    """Directory with stub tensorflow and deepface packages"""
+    root = tmp_path_factory.mktemp("stub_model")
+    (root / "tensorflow").mkdir()
+    (root / "tensorflow" / "__init__.py").write_text(textwrap.dedent(STUB_TENSORFLOW))
+    (root / "deepface").mkdir()
+    (root / "deepface" / "__init__.py").write_text("")
+    (root / "deepface" / "DeepFace.py").write_text(textwrap.dedent(STUB_DEEPFACE))
+    return root
+
+
+@pytest.fixture
+def make_pool(stub_model_path, monkeypatch):
+    """Start pools whose spawned workers import the stub model (they inherit sys.path)"""
+    monkeypatch.syspath_prepend(str(stub_model_path))
+    pools = []
+
+    def start(workers):
+        pool = InferencePool(workers)
+        pools.append(pool)
+        assert pool.wait_ready(timeout=60)
+        return pool
+
+    yield start
+    for pool in pools:
+        pool.close()
+
+
+def crop(value):
+    return np.full((50, 50, 3), value, dtype=np.uint8)
+
+
+def test_results_keep_submission_order(make_pool):
+    pool = make_pool(3)
+    values = [20 + i for i in range(60)]
+
+    embeddings = pool.map([crop(v) for v in values])
+
+    assert [e[0] for e in embeddings] == values
+    assert len(pool.free_slots) == pool.slot_count
+    assert pool.outstanding == {}
+
+
+def test_dead_worker_frees_slot_with_none_embedding(make_pool):
+    pool = make_pool(2)
+
+    embeddings = pool.map([crop(CRASH_VALUE)] + [crop(v) for v in (20, 21, 22)])
+
+    assert embeddings[0] is None
+    assert [e[0] for e in embeddings[1:]] == [20, 21, 22]
+    assert pool.alive_workers == 1
+    assert len(pool.free_slots) == pool.slot_count
+
+
+def test_map_raises_when_no_workers_left(make_pool):
+    pool = make_pool(2)
+
+    with pytest.raises(RuntimeError):
+        pool.map([crop(CRASH_VALUE)] * pool.slot_count + [crop(20)])
+
+    assert pool.alive_workers == 0
+    assert pool.submit(crop(20)) is None
+    assert pool.outstanding == {}
+    assert len(pool.free_slots) == pool.slot_count
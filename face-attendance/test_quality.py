@@ -0,0 +1,125 @@
+"""
+Tests for the face quality gate, using synthetic crops and the enrolled images
+Run with: python -m pytest face-attendance
+"""
+
+import os
+import cv2
+import numpy as np
+import pytest
+from quality import FaceQualityScorer, ENROLLMENT_THRESHOLDS, LIVE_THRESHOLDS
+
+KNOWN_FACES_DIR = os.path.join(os.path.dirname(__file__), "..", "known_faces")
+
+
+def make_face():
+    """Sharp, high-contrast, left/right symmetric 128x128 crop"""
+    rng = np.random.default_rng(0)
+    blocks = rng.choice(np.array([40, 220], dtype=np.uint8), (16, 8))
+    half = cv2.resize(blocks, (64, 128), interpolation=cv2.INTER_NEAREST)
+    return np.hstack([half, cv2.flip(half, 1)])
+
+
+def blurred(face):
+    return cv2.GaussianBlur(face, (31, 31), 0)
+
+
+def dark(face):
+    return face // 8
+
+
+def saturated(face):
+    return 230 + face // 10
+
+
+def too_small(face):
+    return cv2.resize(face, (30, 30))
+
+
+def half_masked(face):
+    masked = face.copy()
+    masked[:, 64:] = 128
+    return masked
+
+
+def test_good_face_passes():
+    scorer = FaceQualityScorer()
+    assert scorer.check(make_face()) == (True, None)
+    assert scorer.check(cv2.cvtColor(make_face(), cv2.COLOR_GRAY2BGR)) == (True, None)
+
+
+@pytest.mark.parametrize("degrade, reason", [
+    (blurred, "blurry"),
+    (dark, "too dark"),
+    (saturated, "too bright"),
+    (too_small, "too small"),
+    (half_masked, "not frontal"),
+])
+def test_bad_face_rejected(degrade, reason):
+    scorer = FaceQualityScorer()
+    assert scorer.check(degrade(make_face())) == (False, reason)
+
+
+def test_low_contrast_rejected():
+    flat = np.full((128, 128), 128, dtype=np.uint8)
+    flat[::2] = 140  # Sharp but nearly uniform
+    assert FaceQualityScorer().check(flat) == (False, "low contrast")
+
+
+def test_live_thresholds_are_looser_than_enrollment():
+    for key, value in ENROLLMENT_THRESHOLDS.items():
+        if key.startswith("min_"):
+            assert LIVE_THRESHOLDS[key] <= value
+        else:
+            assert LIVE_THRESHOLDS[key] >= value
+
+
+def test_counters_and_summary():
+    scorer = FaceQualityScorer()
+    assert scorer.summary() == "No faces checked"
+
+    face = make_face()
+    scorer.check(face)
+    scorer.check(blurred(face))
+    scorer.check(blurred(face))
+    scorer.check(too_small(face))
+
+    assert scorer.checked == 4
+    assert scorer.passed == 1
+    assert scorer.skipped == 3
+    assert scorer.rejected == {"blurry": 2, "too small": 1}
+    assert scorer.summary() == "Skipped 3/4 faces (75%) [blurry: 2, too small: 1]"
+
+    scorer.reset_counters()
+    assert (scorer.checked, scorer.passed, scorer.rejected) == (0, 0, {})
+
+
+
+def test_reject_counts_unscored_captures():
+    scorer = FaceQualityScorer()
+    scorer.check(make_face())
+    assert scorer.reject("no face detected") == (False, "no face detected")
+
+    assert scorer.checked == 2
+    assert scorer.skipped == 1
+    assert scorer.summary() == "Skipped 1/2 faces (50%) [no face detected: 1]"
+
+
+@pytest.mark.skipif(not os.path.isdir(KNOWN_FACES_DIR), reason="no known_faces directory")
+def test_enrolled_faces_pass_enrollment_thresholds():
+    face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+    scorer = FaceQualityScorer(**ENROLLMENT_THRESHOLDS)
+    failures = []
+    for person in os.listdir(KNOWN_FACES_DIR):
+        person_dir = os.path.join(KNOWN_FACES_DIR, person)
+        for img_file in os.listdir(person_dir):
+            gray = cv2.cvtColor(cv2.imread(os.path.join(person_dir, img_file)), cv2.COLOR_BGR2GRAY)
+            faces = face_cascade.detectMultiScale(gray, 1.1, 4)
+            if len(faces) == 0:
+                continue
+            x, y, w, h = max(faces, key=lambda box: box[2] * box[3])
+            ok, reason = scorer.check(gray[y:y+h, x:x+w])
+            if not ok:
+                failures.append((person, img_file, reason))
+    assert scorer.checked > 0
+    assert failures == []
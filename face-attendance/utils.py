@@ -127,6 +127,148 @@ def test_camera():
         print(f"❌ Camera test failed: {e}")
         return False
 
+def _process_rss_kib():
+    """
+    Resident memory of this process in KiB, or None if it cannot be read.
+    Uses the working set on Windows and /proc on Linux; elsewhere falls back
+    to peak RSS, which still rises if memory grows steadily.
+    """
+    if os.name == "nt":
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD),
+                        ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t),
+                        ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t),
+                        ("PeakPagefileUsage", ctypes.c_size_t)]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        get_process = ctypes.windll.kernel32.GetCurrentProcess
+        get_process.restype = wintypes.HANDLE
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(get_process(), ctypes.byref(counters), counters.cb):
+            return None
+        return counters.WorkingSetSize // 1024
+
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        import sys
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and KiB elsewhere
+        return max_rss // 1024 if sys.platform == "darwin" else max_rss
+    except ImportError:
+        return None
+
+def soak_test_render(duration_sec=600, sample_every_sec=30, warmup_sec=60, max_growth_kib=20 * 1024):
+    """
+    Run the live-view renderer on synthetic frames and check that memory stays flat.
+    Fails if RSS grows by more than max_growth_kib between the end of the
+    warm-up period and the end of the run, or if the display stops updating.
+    """
+    import time
+    import tkinter as tk
+    import numpy as np
+    from recognize import FrameRenderer, CAPTURE_INTERVAL_MS
+
+    if _process_rss_kib() is None:
+        print("❌ Cannot read process memory on this platform")
+        return False
+    if duration_sec <= warmup_sec:
+        print("❌ Soak test must run longer than its warm-up period")
+        return False
+
+    print(f"🧪 Render soak test for {duration_sec}s "
+          f"(warm-up {warmup_sec}s, sampling every {sample_every_sec}s)...")
+
+    root = tk.Tk()
+    root.title("Render Soak Test")
+    canvas = tk.Canvas(root, width=640, height=480)
+    canvas.pack()
+    renderer = FrameRenderer(canvas)
+
+    # Two pre-built frames (pure blue and pure red in BGR) so the test itself
+    # does not allocate per tick, and so the displayed pixel can be checked
+    frames = [np.full((480, 640, 3), bgr, dtype=np.uint8) for bgr in ((255, 0, 0), (0, 0, 255))]
+    expected = [(0, 0, 255), (255, 0, 0)]
+    state = {"seq": 0, "start": time.monotonic(), "next_sample": 0, "rendered": 0, "stale": 0,
+             "baseline_rss": None, "final_rss": None}
+
+    def sample(elapsed):
+        rss = _process_rss_kib()
+        print(f"  t={elapsed:6.0f}s | RSS={rss:10d} KiB | canvas items={len(canvas.find_all())}")
+        return rss
+
+    def tick():
+        elapsed = time.monotonic() - state["start"]
+        if elapsed >= duration_sec:
+            state["final_rss"] = sample(elapsed)
+            root.destroy()
+            return
+
+        state["seq"] += 1
+        if renderer.due(state["seq"]):
+            index = state["seq"] % 2
+            frame = frames[index]
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGBA, dst=renderer.buffer_for(frame.shape))
+            renderer.present(state["seq"])
+            state["rendered"] += 1
+            if renderer.shown_pixel(0, 0) != expected[index]:
+                state["stale"] += 1
+
+        if state["baseline_rss"] is None and elapsed >= warmup_sec:
+            state["baseline_rss"] = sample(elapsed)
+        elif elapsed >= state["next_sample"]:
+            sample(elapsed)
+            state["next_sample"] += sample_every_sec
+
+        root.after(CAPTURE_INTERVAL_MS, tick)
+
+    tick()
+    root.mainloop()
+
+    passed = True
+    if state["rendered"] < 2 or state["stale"]:
+        print(f"❌ Displayed image did not follow the frames "
+              f"({state['stale']} of {state['rendered']} renders were stale)")
+        passed = False
+
+    growth = state["final_rss"] - state["baseline_rss"]
+    if growth > max_growth_kib:
+        print(f"❌ Memory grew by {growth} KiB after warm-up (limit {max_growth_kib} KiB)")
+        passed = False
+
+    if passed:
+        print(f"🧪 Soak test passed ({state['rendered']} renders, "
+              f"memory change after warm-up {growth:+d} KiB)")
+    return passed
+
+def benchmark_inference_workers():
+    """Report how embedding throughput scales with worker processes and threads per worker"""
+    from inference_pool import benchmark_workers, WORKER_THREADS
+
+    counts = input("Worker counts to test (default 1,2,4,8): ").strip()
+    threads = input(f"Threads per worker to test (default {WORKER_THREADS}): ").strip()
+    try:
+        worker_counts = tuple(int(c) for c in counts.split(",")) if counts else (1, 2, 4, 8)
+        thread_counts = tuple(int(t) for t in threads.split(",")) if threads else (WORKER_THREADS,)
+    except ValueError:
+        print("❌ Invalid worker or thread counts")
+        return
+    benchmark_workers(worker_counts, thread_counts)
+
 def list_system_info():
     """Display system information and status"""
     print("\n🖥️  SYSTEM INFORMATION")
@@ -183,9 +325,11 @@ if __name__ == "__main__":
         print("3. Test Camera")
         print("4. Backup Data")
         print("5. Clear All Data")
-        print("6. Exit")
+        print("6. Render Soak Test")
+        print("7. Benchmark Inference Workers")
+        print("8. Exit")
 
-        choice = input("\nEnter your choice (1-6): ").strip()
+        choice = input("\nEnter your choice (1-8): ").strip()
 
         if choice == "1":
             list_system_info()
@@ -198,6 +342,10 @@ if __name__ == "__main__":
         elif choice == "5":
             clear_all_data()
         elif choice == "6":
+            soak_test_render()
+        elif choice == "7":
+            benchmark_inference_workers()
+        elif choice == "8":
             print("👋 Goodbye!")
             break
         else: